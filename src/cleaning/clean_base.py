@@ -6,6 +6,105 @@ Handles date conversion, missing values, and unit standardization.
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from typing import Optional, Tuple
+
+
+# Date formats tried against the first date value; month-first comes before
+# day-first so ambiguous dates parse the way pandas would infer them
+_DATE_FORMATS = (
+    '%Y-%m-%d',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y/%m/%d',
+    '%m/%d/%Y',
+    '%d/%m/%Y',
+    '%m-%d-%Y',
+    '%d-%m-%Y',
+    '%d-%b-%Y',
+    '%d-%b-%y',
+)
+
+
+# Numeric columns converted with missing values filled with 0
+_NUMERIC_FILL0_COLUMNS = ('TOTAL VALUE_INR', 'DUTY PAID_INR', 'QUANTITY')
+
+# Unit columns standardized with _UNIT_MAPPING
+_UNIT_COLUMNS = ('UNIT', 'Unit of measure')
+
+# Standardize unit names
+_UNIT_MAPPING = {
+    'nos': 'pcs',
+    'pieces': 'pcs',
+    'piece': 'pcs',
+    'pc': 'pcs',
+    'pcs': 'pcs',
+    'set': 'set',
+    'sets': 'set',
+    'kgs': 'kgs',
+    'kg': 'kgs',
+    'kilograms': 'kgs'
+}
+
+
+def _standardize_unit(units: pd.Series) -> pd.Series:
+    """
+    Lower-case and strip unit names, then map known aliases to a standard unit.
+    Unknown units are left as they are.
+    """
+    return units.astype(pd.StringDtype('pyarrow')).str.lower().str.strip().replace(_UNIT_MAPPING)
+
+
+def _sniff_date_format(dates: pd.Series) -> Optional[str]:
+    """
+    Guess the date format from the first non-null value.
+    Returns None if no known format matches, leaving pandas to infer it.
+    """
+    first_index = dates.first_valid_index()
+    if first_index is None:
+        return None
+    
+    sample = str(dates.loc[first_index]).strip()
+    for date_format in _DATE_FORMATS:
+        try:
+            datetime.strptime(sample, date_format)
+            return date_format
+        except ValueError:
+            continue
+    
+    return None
+
+
+def _parse_dates(dates: pd.Series) -> pd.Series:
+    """
+    Convert a date column to datetime using a single sniffed format.
+    Repeated date strings are parsed once thanks to cache=True.
+    """
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+    
+    return pd.to_datetime(dates, format=_sniff_date_format(dates), errors='coerce', cache=True)
+
+
+def _date_parts(dates: pd.Series) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Split datetimes into year, month and quarter arrays from one NumPy view.
+    Missing dates give NaN parts.
+    """
+    # Timezone-aware dates are split on their local wall-clock time
+    if isinstance(dates.dtype, pd.DatetimeTZDtype):
+        dates = dates.dt.tz_localize(None)
+    
+    # Keep the column's own resolution; casting to [ns] wraps dates outside 1677-2262
+    values = dates.to_numpy()
+    
+    years = values.astype('datetime64[Y]').astype(np.int64) + 1970
+    months = values.astype('datetime64[M]').astype(np.int64) % 12 + 1
+    quarters = (months - 1) // 3 + 1
+    
+    missing = np.isnat(values)
+    if missing.any():
+        years, months, quarters = (np.where(missing, np.nan, part) for part in (years, months, quarters))
+    
+    return years, months, quarters
 
 
 def clean_base_data(df: pd.DataFrame) -> pd.DataFrame:
@@ -18,86 +117,40 @@ def clean_base_data(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         Cleaned DataFrame
     """
-    df = df.copy()
-    
     # Convert Date of Shipment to datetime
-    # The column is named 'DATE' in the CSV
-    date_column = 'DATE'
-    if date_column in df.columns:
-        df[date_column] = pd.to_datetime(df[date_column], errors='coerce')
-        
-        # Derive Year, Month, Quarter
-        df['Year'] = df[date_column].dt.year
-        df['Month'] = df[date_column].dt.month
-        df['Quarter'] = df[date_column].dt.quarter
-        df['Date_of_Shipment'] = df[date_column]  # Rename for clarity
-    else:
-        # Try alternative column names
-        for col in ['Date of Shipment', 'Date', 'DATE']:
-            if col in df.columns:
-                df[col] = pd.to_datetime(df[col], errors='coerce')
-                df['Year'] = df[col].dt.year
-                df['Month'] = df[col].dt.month
-                df['Quarter'] = df[col].dt.quarter
-                df['Date_of_Shipment'] = df[col]
-                break
-    
-    # Handle missing values in Total Value (INR)
-    total_value_col = 'TOTAL VALUE_INR'
-    if total_value_col in df.columns:
-        # Fill missing values with 0 or forward fill based on context
-        df[total_value_col] = pd.to_numeric(df[total_value_col], errors='coerce')
-        df[total_value_col] = df[total_value_col].fillna(0)
-    
-    # Handle missing values in Duty Paid (INR)
-    duty_paid_col = 'DUTY PAID_INR'
-    if duty_paid_col in df.columns:
-        df[duty_paid_col] = pd.to_numeric(df[duty_paid_col], errors='coerce')
-        df[duty_paid_col] = df[duty_paid_col].fillna(0)
+    # The column is named 'DATE' in the CSV; try alternative names otherwise
+    for date_column in ['DATE', 'Date of Shipment', 'Date']:
+        if date_column in df.columns:
+            dates = _parse_dates(df[date_column])
+            years, months, quarters = _date_parts(dates)
+            
+            # Derive Year, Month, Quarter in a single insert
+            df = df.assign(**{
+                date_column: dates,
+                'Year': years,
+                'Month': months,
+                'Quarter': quarters,
+                'Date_of_Shipment': dates,  # Rename for clarity
+            })
+            break
     
-    # Handle missing values in Quantity
-    quantity_col = 'QUANTITY'
-    if quantity_col in df.columns:
-        df[quantity_col] = pd.to_numeric(df[quantity_col], errors='coerce')
-        # Fill with 0 or median based on business logic
-        df[quantity_col] = df[quantity_col].fillna(0)
+    # Handle missing values in Total Value (INR), Duty Paid (INR) and Quantity
+    conversions = {
+        col: pd.to_numeric(df[col], errors='coerce').fillna(0)
+        for col in _NUMERIC_FILL0_COLUMNS if col in df.columns
+    }
     
     # Standardize units (pcs, nos, pieces → pcs)
-    unit_col = 'UNIT'
-    if unit_col in df.columns:
-        df[unit_col] = df[unit_col].astype(str).str.lower().str.strip()
-        # Standardize unit names
-        unit_mapping = {
-            'nos': 'pcs',
-            'pieces': 'pcs',
-            'piece': 'pcs',
-            'pc': 'pcs',
-            'pcs': 'pcs',
-            'set': 'set',
-            'sets': 'set',
-            'kgs': 'kgs',
-            'kg': 'kgs',
-            'kilograms': 'kgs'
-        }
-        df[unit_col] = df[unit_col].map(unit_mapping).fillna(df[unit_col])
+    conversions.update({
+        col: _standardize_unit(df[col])
+        for col in _UNIT_COLUMNS if col in df.columns
+    })
+    if 'UNIT' in conversions:
+        # Only a handful of distinct units, so store them as a categorical
+        conversions['UNIT'] = conversions['UNIT'].astype('category')
     
-    # Also standardize 'Unit of measure' column if it exists
-    unit_measure_col = 'Unit of measure'
-    if unit_measure_col in df.columns:
-        df[unit_measure_col] = df[unit_measure_col].astype(str).str.lower().str.strip()
-        unit_mapping = {
-            'nos': 'pcs',
-            'pieces': 'pcs',
-            'piece': 'pcs',
-            'pc': 'pcs',
-            'pcs': 'pcs',
-            'set': 'set',
-            'sets': 'set',
-            'kgs': 'kgs',
-            'kg': 'kgs',
-            'kilograms': 'kgs'
-        }
-        df[unit_measure_col] = df[unit_measure_col].map(unit_mapping).fillna(df[unit_measure_col])
+    # Apply all conversions in a single insert
+    df = df.assign(**conversions)
     
     return df
 
@@ -1,13 +1,18 @@
 """
 Database loading module for trade data.
-Loads cleaned CSV data into MySQL database.
+Loads cleaned Parquet or CSV data into MySQL database.
 """
 
 import os
+import tempfile
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pymysql
 from sqlalchemy import create_engine
 from dotenv import load_dotenv
 from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
 
 load_dotenv()
 
@@ -17,12 +22,25 @@ DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_PORT = os.getenv("DB_PORT", "3306")
 DB_NAME = os.getenv("DB_NAME", "trade_db")
 
+# Rows read from the cleaned data file per database load
+LOAD_CHUNK_SIZE = 50_000
+# Print progress once every this many chunks
+LOG_EVERY_CHUNKS = 10
+
 # Create engine
+# local_infile lets bulk_insert stream rows with LOAD DATA LOCAL INFILE
 engine = create_engine(
     f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}",
-    echo=False
+    echo=False,
+    connect_args={"local_infile": True}
 )
 
+# MySQL error codes for LOAD DATA LOCAL INFILE being refused
+# (1148: not allowed, 2068: rejected by client, 3948: local_infile is OFF on the server)
+LOCAL_INFILE_REFUSED_CODES = (1148, 2068, 3948)
+# Set once the server refuses LOAD DATA LOCAL INFILE, so later loads go straight to row inserts
+_local_infile_refused = False
+
 
 def map_columns(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -36,8 +54,6 @@ def map_columns(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with mapped column names
     """
-    df = df.copy()
-    
     # Handle duplicate date columns - keep Date_of_Shipment if it exists, otherwise use DATE
     if 'Date_of_Shipment' in df.columns and 'DATE' in df.columns:
         # If both exist, drop DATE and keep Date_of_Shipment
@@ -101,13 +117,17 @@ def map_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def prepare_dataframe_for_db(df: pd.DataFrame) -> pd.DataFrame:
+def prepare_dataframe_for_db(df: pd.DataFrame, valid_table_columns: Optional[List[str]] = None,
+                             verbose: bool = True) -> pd.DataFrame:
     """
     Prepare DataFrame for database insertion.
     Handles data type conversions and missing values.
     
     Args:
         df: Input DataFrame
+        valid_table_columns: Table columns that can be inserted; other columns
+            are dropped before any conversion (keeps all columns if not given)
+        verbose: Print which columns are dropped or missing
         
     Returns:
         Prepared DataFrame
@@ -125,12 +145,28 @@ def prepare_dataframe_for_db(df: pd.DataFrame) -> pd.DataFrame:
         print("  Warning: Duplicate column names after mapping. Removing duplicates...")
         df = df.loc[:, ~df.columns.duplicated(keep='first')]
     
+    # Keep only columns the table accepts, so no work is spent converting the rest
+    if valid_table_columns is not None:
+        valid_columns = [col for col in df.columns if col in valid_table_columns]
+        missing_columns = [col for col in df.columns if col not in valid_table_columns]
+        extra_columns = [col for col in valid_table_columns if col not in df.columns]
+        
+        if verbose:
+            if missing_columns:
+                print(f"  Warning: Dropping {len(missing_columns)} columns not in table: {missing_columns[:5]}...")
+            if extra_columns:
+                print(f"  Note: Table has {len(extra_columns)} columns not in CSV (will use defaults)")
+        
+        df = df[valid_columns]
+    
     # Convert date column
     if 'date_of_shipment' in df.columns:
         # Handle case where column might be duplicated (shouldn't happen now, but just in case)
         if isinstance(df['date_of_shipment'], pd.DataFrame):
             df['date_of_shipment'] = df['date_of_shipment'].iloc[:, 0]
-        df['date_of_shipment'] = pd.to_datetime(df['date_of_shipment'], errors='coerce')
+        # Parquet input is already typed; only text dates need parsing
+        if not pd.api.types.is_datetime64_any_dtype(df['date_of_shipment']):
+            df['date_of_shipment'] = pd.to_datetime(df['date_of_shipment'], errors='coerce')
     
     # Convert numeric columns
     numeric_columns = [
@@ -139,21 +175,32 @@ def prepare_dataframe_for_db(df: pd.DataFrame) -> pd.DataFrame:
         'unit_price_usd', 'total_value_usd', 'embedded_quantity_parsed', 'unit_price_usd_parsed'
     ]
     
-    for col in numeric_columns:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
+    # Convert and fill numeric columns with 0 in one pass per column
+    # (columns that are already numeric, e.g. from Parquet, are only filled)
+    numeric_conversions = {
+        col: (df[col] if pd.api.types.is_numeric_dtype(df[col])
+              else pd.to_numeric(df[col], errors='coerce')).fillna(0)
+        for col in numeric_columns if col in df.columns
+    }
     
-    # Fill NaN values appropriately
-    # For numeric columns, fill with 0
-    for col in numeric_columns:
-        if col in df.columns:
-            df[col] = df[col].fillna(0)
+    # year/month/quarter are INT in the table but float when any shipment date is
+    # missing; LOAD DATA would truncate '2021.0' with a warning, so write whole numbers
+    for col in ('year', 'month', 'quarter'):
+        values = numeric_conversions.get(col)
+        if values is not None and pd.api.types.is_float_dtype(values) and (values % 1 == 0).all():
+            numeric_conversions[col] = values.astype('int64')
+    df = df.assign(**numeric_conversions)
     
     # For text columns, fill with empty string
     text_columns = [col for col in df.columns if col not in numeric_columns and col != 'date_of_shipment']
-    for col in text_columns:
-        if col in df.columns:
-            df[col] = df[col].fillna('')
+    # Categorical columns (e.g. from Parquet) need '' as a category before it can fill them
+    categorical_columns = {
+        col: df[col].cat.add_categories('')
+        for col in text_columns
+        if isinstance(df[col].dtype, pd.CategoricalDtype) and '' not in df[col].cat.categories
+    }
+    df = df.assign(**categorical_columns)
+    df[text_columns] = df[text_columns].fillna('')
     
     return df
 
@@ -178,7 +225,100 @@ def get_table_columns(table_name: str = "trade_data"):
         return None
 
 
-def load_dataframe(df: pd.DataFrame, table_name: str = "trade_data", if_exists: str = "append"):
+def insert_rows(df: pd.DataFrame, table_name: str = "trade_data"):
+    """
+    Insert DataFrame rows into an existing MySQL table with batched INSERT statements.
+    Used when the server does not allow LOAD DATA LOCAL INFILE.
+    
+    Args:
+        df: Prepared DataFrame whose columns all exist in the table
+        table_name: Name of the target table
+    """
+    # Removed method='multi' to avoid parameter naming conflicts
+    # Using chunksize for better performance with large datasets
+    df.to_sql(
+        table_name,
+        engine,
+        if_exists="append",
+        index=False,
+        chunksize=500
+    )
+
+
+def bulk_insert(df: pd.DataFrame, table_name: str = "trade_data"):
+    """
+    Bulk insert DataFrame rows into an existing MySQL table.
+    Writes the rows to a temporary CSV and loads it with LOAD DATA LOCAL INFILE,
+    so the server ingests the whole frame in one statement. Falls back to
+    insert_rows if the server refuses local infile.
+    
+    LOAD DATA LOCAL truncates bad values with warnings instead of failing, so any
+    warnings roll the load back and raise, as a strict-mode INSERT would.
+    
+    Args:
+        df: Prepared DataFrame whose columns all exist in the table
+        table_name: Name of the target table
+    """
+    global _local_infile_refused
+    if _local_infile_refused:
+        insert_rows(df, table_name)
+        return
+    
+    columns = ", ".join(f"`{col}`" for col in df.columns)
+    load_sql = (
+        f"LOAD DATA LOCAL INFILE %s INTO TABLE `{table_name}` "
+        "CHARACTER SET utf8mb4 "
+        "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+        "LINES TERMINATED BY '\\n' "
+        f"({columns})"
+    )
+    
+    fd, csv_path = tempfile.mkstemp(suffix=".csv")
+    try:
+        with os.fdopen(fd, "w", newline="", encoding="utf-8") as tmp:
+            df.to_csv(
+                tmp,
+                index=False,
+                header=False,
+                na_rep="NULL",
+                lineterminator="\n",
+                date_format="%Y-%m-%d %H:%M:%S"
+            )
+        
+        connection = engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(load_sql, (csv_path,))
+            
+            # Rows with truncated or unconvertible values only raise warnings here
+            cursor.execute("SHOW WARNINGS")
+            warnings = [row for row in cursor.fetchall() if row[0] != 'Note']
+            if warnings:
+                connection.rollback()
+                examples = "; ".join(str(row[2]) for row in warnings[:3])
+                raise ValueError(
+                    f"LOAD DATA into '{table_name}' raised {len(warnings)} warnings, "
+                    f"rows were rolled back: {examples}"
+                )
+            
+            connection.commit()
+        except pymysql.err.MySQLError as e:
+            if not e.args or e.args[0] not in LOCAL_INFILE_REFUSED_CODES:
+                raise
+            _local_infile_refused = True
+        finally:
+            connection.close()
+    finally:
+        os.remove(csv_path)
+    
+    if _local_infile_refused:
+        print("  Note: Server does not allow LOAD DATA LOCAL INFILE (local_infile=OFF). "
+              "Falling back to batched INSERTs.")
+        insert_rows(df, table_name)
+
+
+def load_dataframe(df: pd.DataFrame, table_name: str = "trade_data", if_exists: str = "append",
+                   table_columns: Optional[List[str]] = None, verbose: bool = True):
     """
     Load DataFrame into MySQL table.
     
@@ -186,41 +326,34 @@ def load_dataframe(df: pd.DataFrame, table_name: str = "trade_data", if_exists:
         df: DataFrame to load
         table_name: Name of the target table
         if_exists: What to do if table exists ('fail', 'replace', 'append')
+        table_columns: Columns of the target table (fetched from the database if not given)
+        verbose: Print column and row details for this load
     """
     try:
-        # Prepare dataframe
-        df_prepared = prepare_dataframe_for_db(df)
-        print(f"  Prepared {len(df_prepared.columns)} columns for database")
-        
         # Get table columns to ensure we only insert valid columns
-        table_columns = get_table_columns(table_name)
+        if table_columns is None:
+            table_columns = get_table_columns(table_name)
+        valid_table_columns = None
         if table_columns:
-            # Filter to only include columns that exist in the table (excluding id, created_at, updated_at)
+            # Only include columns that exist in the table (excluding id, created_at, updated_at)
             exclude_columns = ['id', 'created_at', 'updated_at']
             valid_table_columns = [col for col in table_columns if col not in exclude_columns]
-            valid_columns = [col for col in df_prepared.columns if col in valid_table_columns]
-            missing_columns = [col for col in df_prepared.columns if col not in valid_table_columns]
-            extra_columns = [col for col in valid_table_columns if col not in df_prepared.columns]
-            
-            if missing_columns:
-                print(f"  Warning: Dropping {len(missing_columns)} columns not in table: {missing_columns[:5]}...")
-            if extra_columns:
-                print(f"  Note: Table has {len(extra_columns)} columns not in CSV (will use defaults)")
-            
-            df_prepared = df_prepared[valid_columns]
-            print(f"  Inserting {len(valid_columns)} columns into database")
         
-        # Load to database
-        # Removed method='multi' to avoid parameter naming conflicts
-        # Using chunksize for better performance with large datasets
-        df_prepared.to_sql(
+        # Prepare dataframe
+        df_prepared = prepare_dataframe_for_db(df, valid_table_columns, verbose=verbose)
+        if verbose:
+            print(f"  Inserting {len(df_prepared.columns)} columns into database")
+        
+        # Create (or replace) the table if needed, then bulk load the rows
+        df_prepared.head(0).to_sql(
             table_name,
             engine,
             if_exists=if_exists,
-            index=False,
-            chunksize=500
+            index=False
         )
-        print(f"✓ Successfully loaded {len(df_prepared)} rows into table '{table_name}'.")
+        bulk_insert(df_prepared, table_name)
+        if verbose:
+            print(f"✓ Successfully loaded {len(df_prepared)} rows into table '{table_name}'.")
     except Exception as e:
         print(f"✗ Error loading data: {e}")
         print(f"  Error type: {type(e).__name__}")
@@ -229,9 +362,63 @@ def load_dataframe(df: pd.DataFrame, table_name: str = "trade_data", if_exists:
         raise
 
 
+def _load_chunks(chunks: Iterable[pd.DataFrame], table_name: str = "trade_data", if_exists: str = "append"):
+    """
+    Load an iterable of DataFrame chunks into MySQL, one chunk at a time.
+    
+    Args:
+        chunks: DataFrame chunks read from the cleaned data file
+        table_name: Name of the target table
+        if_exists: What to do if table exists ('fail', 'replace', 'append')
+    """
+    # Table columns only need to be looked up once for all chunks
+    table_columns = get_table_columns(table_name)
+    
+    total_rows = 0
+    for chunk_number, chunk in enumerate(chunks):
+        if chunk_number == 0:
+            print(f"  File has {len(chunk.columns)} columns")
+            
+            # Check for duplicate columns in the file
+            if chunk.columns.duplicated().any():
+                dup_cols = chunk.columns[chunk.columns.duplicated()].tolist()
+                print(f"  Warning: Found duplicate columns in file: {dup_cols}")
+        
+        # Load to database; later chunks are appended to the first
+        load_dataframe(chunk, table_name, if_exists, table_columns=table_columns,
+                       verbose=(chunk_number == 0))
+        if_exists = "append"
+        
+        total_rows += len(chunk)
+        if (chunk_number + 1) % LOG_EVERY_CHUNKS == 0:
+            print(f"  Loaded {total_rows} rows so far...")
+    
+    print(f"✓ Loaded {total_rows} rows into table '{table_name}'")
+
+
+def _read_csv_chunks(csv_file: str) -> Iterator[pd.DataFrame]:
+    """
+    Read a CSV file in chunks, keeping text columns in Arrow string buffers.
+    """
+    for chunk in pd.read_csv(csv_file, chunksize=LOAD_CHUNK_SIZE):
+        text_columns = chunk.columns[chunk.dtypes == object]
+        chunk[text_columns] = chunk[text_columns].astype("string[pyarrow]")
+        yield chunk
+
+
+def _read_parquet_chunks(parquet_file: str) -> Iterator[pd.DataFrame]:
+    """
+    Read a Parquet file in record batches, keeping text columns in Arrow string buffers.
+    """
+    string_types = {pa.string(): pd.StringDtype("pyarrow"), pa.large_string(): pd.StringDtype("pyarrow")}
+    for batch in pq.ParquetFile(parquet_file).iter_batches(batch_size=LOAD_CHUNK_SIZE):
+        yield batch.to_pandas(types_mapper=string_types.get)
+
+
 def load_from_csv(csv_file: str, table_name: str = "trade_data", if_exists: str = "append"):
     """
     Load cleaned CSV file into MySQL database.
+    The CSV is streamed in chunks so only one chunk is held in memory at a time.
     
     Args:
         csv_file: Path to cleaned CSV file
@@ -241,36 +428,59 @@ def load_from_csv(csv_file: str, table_name: str = "trade_data", if_exists: str
     print(f"Loading data from {csv_file}...")
     
     try:
-        # Read CSV
-        df = pd.read_csv(csv_file, low_memory=False)
-        print(f"✓ Loaded {len(df)} rows from CSV")
-        print(f"  CSV has {len(df.columns)} columns")
-        
-        # Check for duplicate columns in CSV
-        if df.columns.duplicated().any():
-            dup_cols = df.columns[df.columns.duplicated()].tolist()
-            print(f"  Warning: Found duplicate columns in CSV: {dup_cols}")
-        
-        # Load to database
-        load_dataframe(df, table_name, if_exists)
-        
+        _load_chunks(_read_csv_chunks(csv_file), table_name, if_exists)
     except Exception as e:
         print(f"✗ Error loading from CSV: {e}")
         raise
 
 
+def load_from_parquet(parquet_file: str, table_name: str = "trade_data", if_exists: str = "append"):
+    """
+    Load cleaned Parquet file into MySQL database.
+    Column types are stored in the file, so no text parsing is needed,
+    and record batches are streamed so only one batch is held in memory at a time.
+    
+    Args:
+        parquet_file: Path to cleaned Parquet file
+        table_name: Name of the target table
+        if_exists: What to do if table exists ('fail', 'replace', 'append')
+    """
+    print(f"Loading data from {parquet_file}...")
+    
+    try:
+        _load_chunks(_read_parquet_chunks(parquet_file), table_name, if_exists)
+    except Exception as e:
+        print(f"✗ Error loading from Parquet: {e}")
+        raise
+
+
+def load_from_file(data_file: str, table_name: str = "trade_data", if_exists: str = "append"):
+    """
+    Load a cleaned Parquet or CSV file into MySQL database, based on its extension.
+    
+    Args:
+        data_file: Path to cleaned .parquet or .csv file
+        table_name: Name of the target table
+        if_exists: What to do if table exists ('fail', 'replace', 'append')
+    """
+    if Path(data_file).suffix == ".parquet":
+        load_from_parquet(data_file, table_name, if_exists)
+    else:
+        load_from_csv(data_file, table_name, if_exists)
+
+
 if __name__ == "__main__":
     import sys
     
     # Default path
-    csv_file = "data/processed/trade_cleaned.csv"
+    data_file = "data/processed/trade_cleaned.parquet"
     
     if len(sys.argv) > 1:
-        csv_file = sys.argv[1]
+        data_file = sys.argv[1]
     
-    if not Path(csv_file).exists():
-        print(f"✗ Error: File not found: {csv_file}")
-        print("Please run the pipeline first to generate the cleaned CSV.")
+    if not Path(data_file).exists():
+        print(f"✗ Error: File not found: {data_file}")
+        print("Please run the pipeline first to generate the cleaned data file.")
         sys.exit(1)
     
     print("=" * 60)
@@ -278,8 +488,8 @@ if __name__ == "__main__":
     print("=" * 60)
     print(f"Database: {DB_NAME}")
     print(f"Host: {DB_HOST}:{DB_PORT}")
-    print(f"CSV File: {csv_file}")
+    print(f"Data File: {data_file}")
     print("=" * 60)
     
-    load_from_csv(csv_file)
+    load_from_file(data_file)
     print("\n✓ Data loading completed successfully!")
@@ -5,7 +5,43 @@ Calculates derived features like Grand Total, Category, Sub-Category.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Optional
+import re
+from typing import Dict
+
+
+# HSN code mapping to categories
+# 7323 - Table, kitchen or other household articles and parts thereof, of iron or steel
+# 7324 - Sanitary ware and parts thereof, of iron or steel
+# 7325 - Other cast articles of iron or steel
+# 7326 - Other articles of iron or steel
+_CATEGORY_MAPPING = {
+    '7323': 'Household Articles',
+    '7324': 'Sanitary Ware',
+    '7325': 'Cast Articles',
+    '7326': 'Other Iron Steel Articles',
+    '7321': 'Space Heating Apparatus',
+    '7322': 'Other Domestic Articles',
+}
+_CATEGORY_PREFIXES = np.array(sorted(int(prefix) for prefix in _CATEGORY_MAPPING), dtype=np.int64)
+_CATEGORY_LABELS = np.array([_CATEGORY_MAPPING[str(prefix)] for prefix in _CATEGORY_PREFIXES], dtype=object)
+
+# Sub-category mapping based on keywords
+_SUBCATEGORY_KEYWORDS = {
+    'CUTLERY': 'Cutlery & Utensils',
+    'HOLDER': 'Holders & Stands',
+    'SCRUBBER': 'Cleaning Tools',
+    'STRAINER': 'Strainers & Filters',
+    'BASKET': 'Baskets & Containers',
+    'HANGER': 'Hangers & Hooks',
+    'DRAINER': 'Drainers & Racks',
+    'SPRINKLER': 'Sprinklers & Sprayers',
+    'BOTTLE': 'Bottles & Containers',
+    'BLENDER': 'Kitchen Appliances',
+    'HOOK': 'Hooks & Hangers',
+    'STAND': 'Stands & Racks',
+    'CLOTH': 'Clothing Accessories',
+}
+_SUBCATEGORY_PATTERN = re.compile('|'.join(re.escape(keyword) for keyword in _SUBCATEGORY_KEYWORDS))
 
 
 def calculate_grand_total(df: pd.DataFrame) -> pd.DataFrame:
@@ -18,107 +54,95 @@ def calculate_grand_total(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with Grand_Total_INR column
     """
-    df = df.copy()
-    
     total_value_col = 'TOTAL VALUE_INR'
     duty_paid_col = 'DUTY PAID_INR'
     
-    # Ensure numeric types
-    if total_value_col in df.columns:
-        df[total_value_col] = pd.to_numeric(df[total_value_col], errors='coerce').fillna(0)
-    else:
-        df[total_value_col] = 0
-    
-    if duty_paid_col in df.columns:
-        df[duty_paid_col] = pd.to_numeric(df[duty_paid_col], errors='coerce').fillna(0)
-    else:
-        df[duty_paid_col] = 0
-    
-    # Calculate Grand Total
-    df['Grand_Total_INR'] = df[total_value_col] + df[duty_paid_col]
+    # Ensure numeric types (already converted and filled by clean_base_data)
+    new_cols = {}
+    for col in (total_value_col, duty_paid_col):
+        if col not in df.columns:
+            new_cols[col] = pd.Series(0, index=df.index)
+        elif not pd.api.types.is_numeric_dtype(df[col]):
+            new_cols[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+    total_value = new_cols.get(total_value_col, df.get(total_value_col))
+    duty_paid = new_cols.get(duty_paid_col, df.get(duty_paid_col))
+    
+    # Calculate Grand Total on the raw arrays, skipping index alignment
+    new_cols['Grand_Total_INR'] = (
+        total_value.to_numpy(dtype='float64', na_value=np.nan)
+        + duty_paid.to_numpy(dtype='float64', na_value=np.nan)
+    )
     
-    return df
+    return df.assign(**new_cols)
 
 
-def assign_category_from_hsn(hsn_code: str) -> Optional[str]:
+def assign_category_from_hsn(hsn_codes: pd.Series) -> pd.Series:
     """
     Assign category based on HSN code.
     HSN codes are standardized international trade classification codes.
     
     Args:
-        hsn_code: HSN code string
+        hsn_codes: Series of HSN codes
         
     Returns:
-        Category name or None
+        Series of category names ('Other' for unknown prefixes)
     """
-    if pd.isna(hsn_code) or not hsn_code:
-        return None
-    
-    hsn_str = str(hsn_code).strip()
-    
-    # HSN code mapping to categories
-    # 7323 - Table, kitchen or other household articles and parts thereof, of iron or steel
-    # 7324 - Sanitary ware and parts thereof, of iron or steel
-    # 7325 - Other cast articles of iron or steel
-    # 7326 - Other articles of iron or steel
-    
-    hsn_prefix = hsn_str[:4] if len(hsn_str) >= 4 else hsn_str
-    
-    category_mapping = {
-        '7323': 'Household Articles',
-        '7324': 'Sanitary Ware',
-        '7325': 'Cast Articles',
-        '7326': 'Other Iron Steel Articles',
-        '7321': 'Space Heating Apparatus',
-        '7322': 'Other Domestic Articles',
-    }
-    
-    return category_mapping.get(hsn_prefix, 'Other')
+    if not pd.api.types.is_numeric_dtype(hsn_codes):
+        hsn_prefix = hsn_codes.astype(str).str.strip().str.slice(0, 4)
+        return hsn_prefix.map(_CATEGORY_MAPPING).fillna('Other')
+    
+    # Numeric codes: reduce each code to its leading four digits as an integer
+    codes = np.floor(hsn_codes.to_numpy(dtype='float64', na_value=np.nan))
+    valid = codes >= 1000
+    prefix = np.where(valid, codes, 0).astype(np.int64)
+    while (prefix >= 10000).any():
+        prefix = np.where(prefix >= 10000, prefix // 10, prefix)
+    
+    # Look the prefixes up in the sorted prefix table
+    idx = np.clip(np.searchsorted(_CATEGORY_PREFIXES, prefix), 0, len(_CATEGORY_PREFIXES) - 1)
+    known = valid & (_CATEGORY_PREFIXES[idx] == prefix)
+    
+    return pd.Series(np.where(known, _CATEGORY_LABELS[idx], 'Other'), index=hsn_codes.index, dtype=object)
 
 
-def assign_subcategory_from_description(description: str, hsn_code: str) -> Optional[str]:
+def assign_subcategory_from_description(descriptions: pd.Series, hsn_codes: pd.Series) -> pd.Series:
     """
     Assign sub-category based on Goods Description and HSN code.
     
     Args:
-        description: Goods description string
-        hsn_code: HSN code string
+        descriptions: Series of goods descriptions
+        hsn_codes: Series of HSN codes
         
     Returns:
-        Sub-category name or None
+        Series of sub-category names (missing where the description is empty)
     """
-    if pd.isna(description) or not description:
-        return None
-    
-    desc_upper = str(description).upper()
-    
-    # Sub-category mapping based on keywords
-    subcategory_keywords = {
-        'CUTLERY': 'Cutlery & Utensils',
-        'HOLDER': 'Holders & Stands',
-        'SCRUBBER': 'Cleaning Tools',
-        'STRAINER': 'Strainers & Filters',
-        'BASKET': 'Baskets & Containers',
-        'HANGER': 'Hangers & Hooks',
-        'DRAINER': 'Drainers & Racks',
-        'SPRINKLER': 'Sprinklers & Sprayers',
-        'BOTTLE': 'Bottles & Containers',
-        'BLENDER': 'Kitchen Appliances',
-        'HOOK': 'Hooks & Hangers',
-        'STAND': 'Stands & Racks',
-        'CLOTH': 'Clothing Accessories',
-    }
-    
-    for keyword, subcategory in subcategory_keywords.items():
-        if keyword in desc_upper:
-            return subcategory
+    desc_upper = descriptions.astype(str).where(descriptions.notna()).str.upper()
+    has_description = desc_upper.notna() & (desc_upper != '')
+    
+    # One regex pass finds the rows containing any keyword; only those rows are
+    # then checked keyword by keyword, dropping each row at its first match
+    candidates = np.flatnonzero(desc_upper.str.contains(_SUBCATEGORY_PATTERN, na=False).to_numpy(dtype=bool))
+    remaining = desc_upper.iloc[candidates]
+    
+    # First matching keyword wins, in mapping order
+    keyword_sub = np.full(len(desc_upper), None, dtype=object)
+    for keyword, subcategory in _SUBCATEGORY_KEYWORDS.items():
+        if len(candidates) == 0:
+            break
+        found = remaining.str.contains(keyword, regex=False).to_numpy(dtype=bool)
+        keyword_sub[candidates[found]] = subcategory
+        candidates = candidates[~found]
+        remaining = remaining[~found]
+    keyword_sub = pd.Series(keyword_sub, index=descriptions.index)
     
     # Default subcategory based on HSN
-    hsn_str = str(hsn_code).strip() if not pd.isna(hsn_code) else ''
-    if hsn_str.startswith('7323'):
-        return 'General Household Items'
+    hsn_default = np.where(
+        hsn_codes.astype(str).str.strip().str.startswith('7323'),
+        'General Household Items',
+        'Other'
+    )
     
-    return 'Other'
+    return keyword_sub.fillna(pd.Series(hsn_default, index=descriptions.index)).where(has_description)
 
 
 def assign_categories(df: pd.DataFrame) -> pd.DataFrame:
@@ -131,8 +155,6 @@ def assign_categories(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with Category and Sub_Category columns
     """
-    df = df.copy()
-    
     hsn_col = 'HS CODE'
     desc_col = 'GOODS DESCRIPTION'
     
@@ -150,22 +172,18 @@ def assign_categories(df: pd.DataFrame) -> pd.DataFrame:
                 break
     
     # Assign categories
-    df['Category'] = df[hsn_col].apply(assign_category_from_hsn)
+    category = assign_category_from_hsn(df[hsn_col])
     
     # Assign sub-categories
-    df['Sub_Category'] = df.apply(
-        lambda row: assign_subcategory_from_description(
-            row.get(desc_col, ''),
-            row.get(hsn_col, '')
-        ),
-        axis=1
-    )
+    descriptions = df[desc_col] if desc_col in df.columns else pd.Series(None, index=df.index, dtype=object)
+    sub_category = assign_subcategory_from_description(descriptions, df[hsn_col])
     
     # Fill missing categories
-    df['Category'] = df['Category'].fillna('Other')
-    df['Sub_Category'] = df['Sub_Category'].fillna('Other')
-    
-    return df
+    # Few distinct labels, so store them as categoricals
+    return df.assign(
+        Category=category.fillna('Other').astype('category'),
+        Sub_Category=sub_category.fillna('Other').astype('category')
+    )
 
 
 def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
@@ -5,158 +5,123 @@ Extracts Model Name, Model Number, Capacity, Material Type, Embedded Quantity, U
 
 import pandas as pd
 import re
-from typing import Dict, Optional
+from typing import Dict
+
+
+# Pattern: Alphanumeric codes like TH5170, AM-967, SB-12, NP-55, etc.
+_MODEL_NAME_RES = (
+    re.compile(r'\b([A-Z]{1,3}[-]?\d{1,5})\b'),  # Pattern like AM-967, SB-12
+    re.compile(r'\(([A-Z]{1,3}[-]?\d{1,5})\)'),  # Pattern in parentheses
+    re.compile(r'MODEL[:\s]+([A-Z]{1,3}[-]?\d{1,5})'),  # Explicit MODEL: prefix
+)
+
+# Look for patterns like (RYX-02-020), (2628), (3888)
+_MODEL_NUMBER_RES = (
+    re.compile(r'\(([A-Z]{2,4}[-]?\d{1,3}[-]?\d{1,3})\)'),  # Pattern like RYX-02-020
+    re.compile(r'\((\d{3,6})\)'),  # Pattern like (2628), (3888)
+    re.compile(r'MODEL\s+NO[:\s]+([A-Z0-9-]+)'),  # Explicit MODEL NO: prefix
+)
+
+# Look for capacity patterns like "10PCS SET", "6PCS SET", "2PCS SET"
+_CAPACITY_RES = (
+    re.compile(r'(\d+)\s*PCS?\s*SET'),
+    re.compile(r'CAPACITY[:\s]+([\d.]+)'),
+    re.compile(r'(\d+)\s*L'),
+    re.compile(r'(\d+)\s*ML'),
+)
+
+# Pattern: QTY: 600 PCS, QTY:336000 SETS, QTY 6336 PCS
+_EMBEDDED_QUANTITY_RES = (
+    re.compile(r'QTY[:\s]+([\d,]+)\s*(?:PCS?|SETS?|NOS?|KGS?|KG)'),
+    re.compile(r'QUANTITY[:\s]+([\d,]+)'),
+)
+
+# Pattern: USD 2.03 PER PCS, USD:0.139 PER SETS, USD 0.9718 PER PCS
+_UNIT_PRICE_USD_RES = (
+    re.compile(r'USD[:\s]+([\d.]+)\s*PER\s*(?:PCS?|SETS?|NOS?|KGS?|KG)'),
+    re.compile(r'USD\s+([\d.]+)\s*PER'),
+    re.compile(r'\$([\d.]+)\s*PER'),
+)
+
+# Description column names, in order of preference
+DESCRIPTION_COLUMNS = ('GOODS DESCRIPTION', 'Goods Description', 'Description')
+
+# Every column parse_goods_description reads: the description and the existing
+# values used as fallbacks for the _Final columns
+PARSE_INPUT_COLUMNS = DESCRIPTION_COLUMNS + ('Model Name', 'Model Number', 'Capacity')
+
+# Common materials
+_MATERIALS = ('STEEL', 'MILD STEEL', 'STAINLESS STEEL', 'ALUMINUM',
+              'PLASTIC', 'WOOD', 'GLASS', 'CERAMIC', 'BRASS', 'COPPER')
+
+
+def _extract_first(descriptions: pd.Series, patterns) -> pd.Series:
+    """
+    Extract the first capture group of the first pattern that matches.
+    Patterns are tried in priority order, one vectorized sweep each.
+    """
+    result = None
+    for pattern in patterns:
+        # An all-missing extract comes back as float on pandas < 3; object keeps .str usable
+        extracted = descriptions.str.extract(pattern, expand=False).astype(object)
+        if result is None:
+            result = extracted
+        else:
+            missing = result.isna()
+            result[missing] = extracted[missing]
+    return result.str.strip()
 
 
-def extract_model_name(description: str) -> Optional[str]:
+def extract_model_name(descriptions: pd.Series) -> pd.Series:
     """
-    Extract model name from goods description.
+    Extract model name from upper-cased goods descriptions.
     Model names are often in format like "TH5170", "AM-967", "SB-12", etc.
     """
-    if pd.isna(description) or not description:
-        return None
-    
-    description = str(description).upper()
-    
-    # Pattern: Alphanumeric codes like TH5170, AM-967, SB-12, NP-55, etc.
-    patterns = [
-        r'\b([A-Z]{1,3}[-]?\d{1,5})\b',  # Pattern like AM-967, SB-12
-        r'\(([A-Z]{1,3}[-]?\d{1,5})\)',  # Pattern in parentheses
-        r'MODEL[:\s]+([A-Z]{1,3}[-]?\d{1,5})',  # Explicit MODEL: prefix
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, description)
-        if match:
-            return match.group(1).strip()
-    
-    return None
+    return _extract_first(descriptions, _MODEL_NAME_RES)
 
 
-def extract_model_number(description: str) -> Optional[str]:
+def extract_model_number(descriptions: pd.Series) -> pd.Series:
     """
-    Extract model number from goods description.
+    Extract model number from goods descriptions (case-sensitive).
     Often found in parentheses or after model name.
     """
-    if pd.isna(description) or not description:
-        return None
-    
-    description = str(description)
-    
-    # Look for patterns like (RYX-02-020), (2628), (3888)
-    patterns = [
-        r'\(([A-Z]{2,4}[-]?\d{1,3}[-]?\d{1,3})\)',  # Pattern like RYX-02-020
-        r'\((\d{3,6})\)',  # Pattern like (2628), (3888)
-        r'MODEL\s+NO[:\s]+([A-Z0-9-]+)',  # Explicit MODEL NO: prefix
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, description)
-        if match:
-            return match.group(1).strip()
-    
-    return None
+    return _extract_first(descriptions, _MODEL_NUMBER_RES)
 
 
-def extract_capacity(description: str) -> Optional[str]:
+def extract_capacity(descriptions: pd.Series) -> pd.Series:
     """
-    Extract capacity information from goods description.
+    Extract capacity information from upper-cased goods descriptions.
     """
-    if pd.isna(description) or not description:
-        return None
-    
-    description = str(description).upper()
-    
-    # Look for capacity patterns like "10PCS SET", "6PCS SET", "2PCS SET"
-    patterns = [
-        r'(\d+)\s*PCS?\s*SET',
-        r'CAPACITY[:\s]+([\d.]+)',
-        r'(\d+)\s*L',
-        r'(\d+)\s*ML',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, description)
-        if match:
-            return match.group(1).strip()
-    
-    return None
+    return _extract_first(descriptions, _CAPACITY_RES)
 
 
-def extract_material_type(description: str) -> Optional[str]:
+def extract_material_type(descriptions: pd.Series) -> pd.Series:
     """
-    Extract material type from goods description.
+    Extract material type from upper-cased goods descriptions.
     """
-    if pd.isna(description) or not description:
-        return None
-    
-    description = str(description).upper()
-    
-    # Common materials
-    materials = ['STEEL', 'MILD STEEL', 'STAINLESS STEEL', 'ALUMINUM', 
-                 'PLASTIC', 'WOOD', 'GLASS', 'CERAMIC', 'BRASS', 'COPPER']
+    result = pd.Series(None, index=descriptions.index, dtype=object)
+    for material in _MATERIALS:
+        found = descriptions.str.contains(material, regex=False, na=False) & result.isna()
+        result[found] = material.replace('MILD STEEL', 'MILD_STEEL').replace('STAINLESS STEEL', 'STAINLESS_STEEL')
     
-    for material in materials:
-        if material in description:
-            return material.replace('MILD STEEL', 'MILD_STEEL').replace('STAINLESS STEEL', 'STAINLESS_STEEL')
-    
-    return None
+    return result
 
 
-def extract_embedded_quantity(description: str) -> Optional[float]:
+def extract_embedded_quantity(descriptions: pd.Series) -> pd.Series:
     """
-    Extract quantity embedded in goods description.
+    Extract quantity embedded in upper-cased goods descriptions.
     Pattern: QTY: 600 PCS, QTY:336000 SETS, etc.
     """
-    if pd.isna(description) or not description:
-        return None
-    
-    description = str(description).upper()
-    
-    # Pattern: QTY: 600 PCS, QTY:336000 SETS, QTY 6336 PCS
-    patterns = [
-        r'QTY[:\s]+([\d,]+)\s*(?:PCS?|SETS?|NOS?|KGS?|KG)',
-        r'QUANTITY[:\s]+([\d,]+)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, description)
-        if match:
-            qty_str = match.group(1).replace(',', '').strip()
-            try:
-                return float(qty_str)
-            except ValueError:
-                return None
-    
-    return None
+    qty_str = _extract_first(descriptions, _EMBEDDED_QUANTITY_RES).str.replace(',', '', regex=False)
+    return pd.to_numeric(qty_str, errors='coerce')
 
 
-def extract_unit_price_usd(description: str) -> Optional[float]:
+def extract_unit_price_usd(descriptions: pd.Series) -> pd.Series:
     """
-    Extract unit price in USD from goods description.
+    Extract unit price in USD from upper-cased goods descriptions.
     Pattern: USD 2.03 PER PCS, USD 0.139 PER SETS, etc.
     """
-    if pd.isna(description) or not description:
-        return None
-    
-    description = str(description).upper()
-    
-    # Pattern: USD 2.03 PER PCS, USD:0.139 PER SETS, USD 0.9718 PER PCS
-    patterns = [
-        r'USD[:\s]+([\d.]+)\s*PER\s*(?:PCS?|SETS?|NOS?|KGS?|KG)',
-        r'USD\s+([\d.]+)\s*PER',
-        r'\$([\d.]+)\s*PER',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, description)
-        if match:
-            try:
-                return float(match.group(1).strip())
-            except ValueError:
-                return None
-    
-    return None
+    return pd.to_numeric(_extract_first(descriptions, _UNIT_PRICE_USD_RES), errors='coerce')
 
 
 def parse_goods_description(df: pd.DataFrame) -> pd.DataFrame:
@@ -169,42 +134,50 @@ def parse_goods_description(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with additional parsed columns
     """
-    df = df.copy()
+    # Try alternative column names
+    for desc_col in DESCRIPTION_COLUMNS:
+        if desc_col in df.columns:
+            break
+    else:
+        print("Warning: Goods Description column not found")
+        return df
     
-    desc_col = 'GOODS DESCRIPTION'
-    if desc_col not in df.columns:
-        # Try alternative column names
-        for col in ['Goods Description', 'GOODS DESCRIPTION', 'Description']:
-            if col in df.columns:
-                desc_col = col
-                break
-        else:
-            print("Warning: Goods Description column not found")
-            return df
+    # Descriptions repeat heavily (same SKU shipped many times), so parse each
+    # distinct description once and broadcast the results back to every row
+    desc = df[desc_col]
+    codes, uniques = pd.factorize(desc, use_na_sentinel=False)
+    unique_desc = pd.Series(uniques)
+    
+    # Convert to text once, keeping missing descriptions missing
+    desc_text = unique_desc.astype(str).where(unique_desc.notna())
+    desc_upper = desc_text.str.upper()
     
     # Extract information
-    df['Model_Name_Parsed'] = df[desc_col].apply(extract_model_name)
-    df['Model_Number_Parsed'] = df[desc_col].apply(extract_model_number)
-    df['Capacity_Parsed'] = df[desc_col].apply(extract_capacity)
-    df['Material_Type_Parsed'] = df[desc_col].apply(extract_material_type)
-    df['Embedded_Quantity_Parsed'] = df[desc_col].apply(extract_embedded_quantity)
-    df['Unit_Price_USD_Parsed'] = df[desc_col].apply(extract_unit_price_usd)
+    parsed = {
+        'Model_Name_Parsed': extract_model_name(desc_upper),
+        'Model_Number_Parsed': extract_model_number(desc_text),
+        'Capacity_Parsed': extract_capacity(desc_upper),
+        'Material_Type_Parsed': extract_material_type(desc_upper),
+        'Embedded_Quantity_Parsed': extract_embedded_quantity(desc_upper),
+        'Unit_Price_USD_Parsed': extract_unit_price_usd(desc_upper),
+    }
+    new_cols = {
+        col: pd.Series(values.to_numpy()[codes], index=df.index)
+        for col, values in parsed.items()
+    }
     
     # Use existing columns if parsed values are missing
-    if 'Model Name' in df.columns:
-        df['Model_Name_Final'] = df['Model_Name_Parsed'].fillna(df['Model Name'])
-    else:
-        df['Model_Name_Final'] = df['Model_Name_Parsed']
-    
-    if 'Model Number' in df.columns:
-        df['Model_Number_Final'] = df['Model_Number_Parsed'].fillna(df['Model Number'])
-    else:
-        df['Model_Number_Final'] = df['Model_Number_Parsed']
-    
-    if 'Capacity' in df.columns:
-        df['Capacity_Final'] = df['Capacity_Parsed'].fillna(df['Capacity'])
-    else:
-        df['Capacity_Final'] = df['Capacity_Parsed']
+    for final_col, parsed_col, existing_col in [
+        ('Model_Name_Final', 'Model_Name_Parsed', 'Model Name'),
+        ('Model_Number_Final', 'Model_Number_Parsed', 'Model Number'),
+        ('Capacity_Final', 'Capacity_Parsed', 'Capacity'),
+    ]:
+        if existing_col in df.columns:
+            # Fall back to the existing value as text so the column keeps a single type
+            existing = df[existing_col]
+            new_cols[final_col] = new_cols[parsed_col].fillna(existing.astype(str).where(existing.notna()))
+        else:
+            new_cols[final_col] = new_cols[parsed_col]
     
-    return df
-
+    # Add all parsed columns in a single insert
+    return df.assign(**new_cols)
@@ -6,23 +6,102 @@ Orchestrates data cleaning, parsing, and feature engineering steps.
 import pandas as pd
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import Callable, Optional, Sequence
 
 # Add src to path for imports
 sys.path.append(str(Path(__file__).parent))
 
 from cleaning.clean_base import clean_base_data
-from parsing.parse_goods_description import parse_goods_description
+from parsing.parse_goods_description import parse_goods_description, PARSE_INPUT_COLUMNS
 from feature_engineering.features import engineer_features
 
+# Pipeline steps return new frames via assign instead of defensive copies;
+# Copy-on-Write (always enabled from pandas 3.0) lets those share unchanged columns
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
 
-def run_pipeline(input_file: str, output_file: str) -> pd.DataFrame:
+
+def _new_columns(func: Callable[[pd.DataFrame], pd.DataFrame], chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    Run a pipeline step on a chunk and return only the columns it added.
+    """
+    return func(chunk).drop(columns=chunk.columns)
+
+
+def apply_in_parallel(func: Callable[[pd.DataFrame], pd.DataFrame], df: pd.DataFrame,
+                      workers: int, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Apply a row-wise pipeline step to row chunks of the DataFrame in worker processes.
+    Only the input columns the step reads are sent to the workers, and only the
+    columns it adds are sent back and assigned here.
+    
+    Args:
+        func: Pipeline step with no cross-row state that only adds columns
+        df: Input DataFrame
+        workers: Number of worker processes (1 runs the step in this process)
+        columns: Columns the step reads (all columns if not given)
+        
+    Returns:
+        DataFrame with the columns added by the step
+    """
+    if workers <= 1 or len(df) < workers:
+        return func(df)
+    
+    subset = df if columns is None else df[[col for col in columns if col in df.columns]]
+    chunk_size = -(-len(subset) // workers)
+    chunks = [subset.iloc[start:start + chunk_size] for start in range(0, len(subset), chunk_size)]
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        added = pd.concat(executor.map(partial(_new_columns, func), chunks))
+    added.index = df.index
+    
+    return df.assign(**{col: added[col] for col in added.columns})
+
+
+def _dedupe_columns(columns: Sequence[str]) -> list:
+    """
+    Rename repeated column names the way pandas' C parser does ('col', 'col.1', 'col.2', ...).
+    The pyarrow CSV engine keeps duplicate headers (e.g. the two 'Unit of measure'
+    columns in the raw export) under the same name.
+    """
+    columns = list(columns)
+    counts = {}
+    for i, col in enumerate(columns):
+        original = col
+        count = counts.get(col, 0)
+        while count > 0:
+            counts[original] = count + 1
+            col = f"{original}.{count}"
+            # Skip suffixes already taken by another header
+            count = count + 1 if col in columns else counts.get(col, 0)
+        columns[i] = col
+        counts[col] = count + 1
+    return columns
+
+
+def _workers_from_env() -> int:
+    """
+    Read the number of parse workers from the PIPELINE_WORKERS environment variable.
+    """
+    value = os.getenv("PIPELINE_WORKERS", "1")
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"PIPELINE_WORKERS must be an integer, got {value!r}") from None
+
+
+def run_pipeline(input_file: str, output_file: str, workers: Optional[int] = None) -> pd.DataFrame:
     """
     Run the complete data pipeline.
     
     Args:
         input_file: Path to raw CSV file
-        output_file: Path to save cleaned CSV file
+        output_file: Path to save cleaned data (.parquet or .csv)
+        workers: Processes used to parse goods descriptions
+            (defaults to the PIPELINE_WORKERS environment variable, or 1)
         
     Returns:
         Final cleaned DataFrame
@@ -34,7 +113,11 @@ def run_pipeline(input_file: str, output_file: str) -> pd.DataFrame:
     # Step 1: Load raw data
     print("\n[Step 1] Loading raw data...")
     try:
-        df = pd.read_csv(input_file, low_memory=False)
+        df = pd.read_csv(input_file, engine="pyarrow")
+        df.columns = _dedupe_columns(df.columns)
+        # Keep text columns in Arrow string buffers instead of Python objects
+        text_columns = df.columns[df.dtypes == object]
+        df[text_columns] = df[text_columns].astype("string[pyarrow]")
         print(f"✓ Loaded {len(df)} rows from {input_file}")
     except Exception as e:
         print(f"✗ Error loading data: {e}")
@@ -52,7 +135,9 @@ def run_pipeline(input_file: str, output_file: str) -> pd.DataFrame:
     # Step 3: Parse goods description
     print("\n[Step 3] Parsing goods description...")
     try:
-        df = parse_goods_description(df)
+        if workers is None:
+            workers = _workers_from_env()
+        df = apply_in_parallel(parse_goods_description, df, workers, columns=PARSE_INPUT_COLUMNS)
         print(f"✓ Goods description parsing completed")
     except Exception as e:
         print(f"✗ Error parsing goods description: {e}")
@@ -74,7 +159,11 @@ def run_pipeline(input_file: str, output_file: str) -> pd.DataFrame:
         output_path = Path(output_file)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        df.to_csv(output_file, index=False)
+        # Parquet keeps dtypes and is much faster to write and reload than CSV
+        if output_path.suffix == ".parquet":
+            df.to_parquet(output_file, engine="pyarrow", compression="zstd", index=False)
+        else:
+            df.to_csv(output_file, index=False)
         print(f"✓ Saved {len(df)} rows to {output_file}")
     except Exception as e:
         print(f"✗ Error saving data: {e}")
@@ -95,7 +184,7 @@ def run_pipeline(input_file: str, output_file: str) -> pd.DataFrame:
 if __name__ == "__main__":
     # Default paths
     input_file = "data/raw/import_data_2017_2025.csv"
-    output_file = "data/processed/trade_cleaned_new.csv"
+    output_file = "data/processed/trade_cleaned.parquet"
     
     # Allow command line arguments
     if len(sys.argv) > 1:
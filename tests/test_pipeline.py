@@ -0,0 +1,31 @@
+"""
+Regression checks for the data pipeline.
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from pipeline import run_pipeline
+
+
+def test_repeated_header_is_renamed_like_c_parser(tmp_path):
+    # The raw export repeats the 'Unit of measure' header
+    input_file = tmp_path / "raw.csv"
+    input_file.write_text(
+        "DATE,HS CODE,GOODS DESCRIPTION,UNIT,Unit of measure,QUANTITY,Unit of measure\n"
+        "2023-06-15,73239990,STEEL BOTTLE 500 ML,pcs,NOS,5,PCS\n"
+        "2021-01-04,73239990,GLASS JAR,Kg,KGS,3.5,KGS\n"
+    )
+    output_file = tmp_path / "trade_cleaned.parquet"
+    
+    df = run_pipeline(str(input_file), str(output_file))
+    
+    expected = list(pd.read_csv(input_file, nrows=0).columns)
+    assert expected[-1] == "Unit of measure.1"
+    assert list(df.columns[:len(expected)]) == expected
+    assert df.columns.is_unique
+    assert list(pd.read_parquet(output_file).columns) == list(df.columns)